@@ -0,0 +1,122 @@
+import numpy as np
+from PIL import Image
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+PILLOW_KERNELS = {
+    'nearest': Image.NEAREST,
+    'box': Image.BOX,
+    'area': Image.BOX,
+    'bilinear': Image.BILINEAR,
+    'hamming': Image.HAMMING,
+    'bicubic': Image.BICUBIC,
+    'lanczos': Image.LANCZOS,
+}
+
+# OpenCV has no hamming filter, so that kernel always runs on Pillow
+OPENCV_KERNELS = {
+    'nearest': 'INTER_NEAREST',
+    'box': 'INTER_AREA',
+    'area': 'INTER_AREA',
+    'bilinear': 'INTER_LINEAR',
+    'bicubic': 'INTER_CUBIC',
+    'lanczos': 'INTER_LANCZOS4',
+}
+
+# OpenCV does not premultiply alpha like Pillow, so RGBA and other modes stay on Pillow
+OPENCV_MODES = ('L', 'RGB')
+
+RESIZE_KERNELS = tuple(PILLOW_KERNELS)
+RESIZE_BACKENDS = ('pillow', 'opencv')
+
+# Integer pre-reduction stops once the image is within this factor of the target size
+REDUCING_GAP = 3.0
+
+
+def fit_box(image_size, size, centering=(0.5, 0.5)):
+    """
+    Return the crop box that matches the aspect ratio of size, the same way ImageOps.fit crops.
+    """
+    image_width, image_height = image_size
+    image_ratio = image_width / image_height
+    output_ratio = size[0] / size[1]
+
+    if image_ratio >= output_ratio:
+        crop_width = output_ratio * image_height
+        crop_height = image_height
+    else:
+        crop_width = image_width
+        crop_height = image_width / output_ratio
+
+    left = (image_width - crop_width) * centering[0]
+    top = (image_height - crop_height) * centering[1]
+    return left, top, left + crop_width, top + crop_height
+
+
+def fit_image_pillow(image, size, kernel='lanczos', centering=(0.5, 0.5)):
+    """
+    Crop and resize with Pillow, reducing by an integer factor before the final filter.
+    """
+    box = fit_box(image.size, size, centering)
+    return image.resize(size, PILLOW_KERNELS[kernel], box=box, reducing_gap=REDUCING_GAP)
+
+
+def fit_image_opencv(image, size, kernel='lanczos', centering=(0.5, 0.5)):
+    """
+    Crop and resize with OpenCV, which spreads the resize across threads.
+    Like Pillow's reducing_gap, large downscales are first shrunk with INTER_AREA before the final filter.
+    OpenCV kernels keep a fixed support when shrinking, so the remaining downscale is low-passed first.
+    """
+    left, top, right, bottom = (int(round(v)) for v in fit_box(image.size, size, centering))
+    img_array = np.asarray(image)[top:bottom, left:right]
+
+    factor_x = max(int(img_array.shape[1] / size[0] / REDUCING_GAP), 1)
+    factor_y = max(int(img_array.shape[0] / size[1] / REDUCING_GAP), 1)
+    if kernel != 'nearest' and (factor_x > 1 or factor_y > 1):
+        reduced_size = (-(-img_array.shape[1] // factor_x), -(-img_array.shape[0] // factor_y))
+        img_array = cv2.resize(np.ascontiguousarray(img_array), reduced_size, interpolation=cv2.INTER_AREA)
+
+    scale_x = img_array.shape[1] / size[0]
+    scale_y = img_array.shape[0] / size[1]
+    if kernel not in ('nearest', 'box', 'area') and (scale_x > 1 or scale_y > 1):
+        sigma_x = max((scale_x - 1) / 2, 1e-3)
+        sigma_y = max((scale_y - 1) / 2, 1e-3)
+        img_array = cv2.GaussianBlur(np.ascontiguousarray(img_array), (0, 0), sigmaX=sigma_x, sigmaY=sigma_y)
+
+    interpolation = getattr(cv2, OPENCV_KERNELS[kernel])
+    resized_array = cv2.resize(np.ascontiguousarray(img_array), size, interpolation=interpolation)
+    return Image.fromarray(resized_array, mode=image.mode)
+
+
+def resolve_backend(backend, kernel='lanczos'):
+    """
+    Fall back to Pillow when OpenCV is unavailable or cannot honour the requested kernel.
+    """
+    if backend == 'opencv' and cv2 is None:
+        print("OpenCV is not installed (pip install opencv-python). Falling back to pillow for resizing.")
+        return 'pillow'
+    if backend == 'opencv' and kernel not in OPENCV_KERNELS:
+        print(f"OpenCV has no {kernel} filter. Falling back to pillow for resizing.")
+        return 'pillow'
+    return backend
+
+
+def fit_image(image, size, kernel='lanczos', backend='pillow', centering=(0.5, 0.5)):
+    """
+    Resize and crop the image to exactly the specified size using the chosen kernel and backend.
+    Images already at the target size are returned unchanged.
+    """
+    if kernel not in PILLOW_KERNELS:
+        raise ValueError(f"Unknown resize kernel {kernel!r}. Supported kernels are {', '.join(RESIZE_KERNELS)}.")
+
+    size = tuple(size)
+    if image.size == size:
+        return image
+
+    if backend == 'opencv' and cv2 is not None and kernel in OPENCV_KERNELS and image.mode in OPENCV_MODES:
+        return fit_image_opencv(image, size, kernel, centering)
+
+    return fit_image_pillow(image, size, kernel, centering)
@@ -2,7 +2,8 @@ import os
 import sys
 from itertools import permutations
 import numpy as np
-from PIL import Image, ImageOps
+from PIL import Image
+from resize import RESIZE_BACKENDS, RESIZE_KERNELS, fit_image, resolve_backend
 
 
 def save_image(image, filename, image_format):
@@ -46,14 +47,14 @@ def generate_channel_orders():
     return all_orders
 
 
-def letterbox_image(image, target_size):
+def letterbox_image(image, target_size, kernel='lanczos', backend='pillow'):
     """
     Resize and letterbox the image to fit within the specified size.
     """
-    return ImageOps.fit(image, target_size, Image.LANCZOS, 0, (0.5, 0.5))
+    return fit_image(image, target_size, kernel, backend)
 
 
-def resize_images(input_folder, output_folder, resize_width):
+def resize_images(input_folder, output_folder, resize_width, kernel='lanczos', backend='pillow'):
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
@@ -66,7 +67,7 @@ def resize_images(input_folder, output_folder, resize_width):
             if os.path.isfile(file_path) and file_path.lower().endswith(valid_extensions):
                 image = Image.open(file_path)
                 target_height = int(resize_width * image.size[1] / image.size[0])
-                resized_image = letterbox_image(image, (resize_width, target_height))
+                resized_image = letterbox_image(image, (resize_width, target_height), kernel, backend)
                 relative_path = os.path.relpath(file_path, input_folder)
                 resized_file_path = os.path.join(output_folder, relative_path)
                 os.makedirs(os.path.dirname(resized_file_path), exist_ok=True)
@@ -97,19 +98,33 @@ def process_images(image_path, image_format, base_folder_name, file_index, paren
 
 
 def main():
-    if len(sys.argv) != 4:
-        print("Usage: python shuffle.py <folder_path> <image_format> <resize_width>")
+    if len(sys.argv) not in (4, 5, 6):
+        print("Usage: python shuffle.py <folder_path> <image_format> <resize_width> [resize_kernel] [resize_backend]")
         print("Format options: png, webp")
+        print(f"Kernel options: {', '.join(RESIZE_KERNELS)} (default lanczos)")
+        print("Backend options: pillow, opencv (default pillow; opencv requires pip install opencv-python)")
         sys.exit(1)
 
     folder_path = sys.argv[1]
     image_format = sys.argv[2].lower()
     resize_width = int(sys.argv[3])
+    resize_kernel = sys.argv[4].lower() if len(sys.argv) > 4 else 'lanczos'
+    resize_backend = sys.argv[5].lower() if len(sys.argv) > 5 else 'pillow'
 
     if image_format not in ['png', 'webp']:
         print("Invalid format. Supported formats are png and webp.")
         sys.exit(1)
 
+    if resize_kernel not in RESIZE_KERNELS:
+        print(f"Invalid resize kernel. Supported kernels are {', '.join(RESIZE_KERNELS)}.")
+        sys.exit(1)
+
+    if resize_backend not in RESIZE_BACKENDS:
+        print(f"Invalid resize backend. Supported backends are {', '.join(RESIZE_BACKENDS)}.")
+        sys.exit(1)
+
+    resize_backend = resolve_backend(resize_backend, resize_kernel)
+
     base_folder_name = os.path.basename(os.path.normpath(folder_path))
     parent_folder = os.path.dirname(folder_path)
     parent_output_folder = os.path.join(parent_folder, f"{base_folder_name}_{resize_width}px_output")
@@ -120,7 +135,7 @@ def main():
     resized_folder = os.path.join(parent_output_folder, "resized")
 
     # Resize images and get the paths of resized images
-    resized_images = resize_images(folder_path, resized_folder, resize_width)
+    resized_images = resize_images(folder_path, resized_folder, resize_width, resize_kernel, resize_backend)
 
     for file_index, file_path in enumerate(resized_images):
         process_images(file_path, image_format, base_folder_name, file_index, parent_output_folder)
@@ -1,7 +1,8 @@
 import os
 import sys
 import numpy as np
-from PIL import Image, ImageOps
+from PIL import Image
+from resize import RESIZE_BACKENDS, RESIZE_KERNELS, fit_image, resolve_backend
 from concurrent.futures import ProcessPoolExecutor
 
 
@@ -17,8 +18,9 @@ def save_image(image, filename, image_format, compression):
 
 def generate_tween_frames(image1, image2, num_tween_frames, start_index, base_filename, final_dir, image_format,
                           compression, counter):
-    img_array1 = np.array(image1)
-    img_array2 = np.array(image2)
+    # Accept either PIL images or pre-decoded arrays so shared frames are only converted once
+    img_array1 = np.asarray(image1)
+    img_array2 = np.asarray(image2)
     tween_filenames = []
 
     for i in range(1, num_tween_frames + 1):
@@ -34,8 +36,7 @@ def generate_tween_frames(image1, image2, num_tween_frames, start_index, base_fi
     return tween_filenames, counter
 
 
-def setup_output_folder(center_image_path, input_folder):
-    base_filename = os.path.splitext(os.path.basename(center_image_path))[0]
+def setup_output_folder(base_filename, input_folder):
     source_folder_name = os.path.basename(os.path.normpath(input_folder))
     parent_dir = os.path.dirname(os.path.normpath(input_folder))  # Get the parent directory of the input folder
     output_folder = os.path.join(parent_dir, f"{base_filename}_{source_folder_name}_tween")
@@ -44,87 +45,179 @@ def setup_output_folder(center_image_path, input_folder):
     return output_folder
 
 
-def letterbox_image(image, size):
+def letterbox_image(image, size, kernel='lanczos', backend='pillow'):
     """
     Resize and letterbox the image to fit within the specified size.
     """
-    return ImageOps.fit(image, size, Image.LANCZOS, 0, (0.5, 0.5))
+    return fit_image(image, size, kernel, backend)
 
 
-def process_tween_images(input_folder, center_image_path, num_tween_frames, image_format, compression, repeat_frames):
+def load_center_image(center_image_path, mode, target_size, center_cache, kernel='lanczos', backend='pillow'):
+    """
+    Load a center image converted and letterboxed to match the input frames, reusing cached results.
+    """
+    key = (os.path.abspath(center_image_path), mode, target_size, kernel, backend)
+    if key not in center_cache:
+        center_image = letterbox_image(Image.open(center_image_path).convert(mode), target_size, kernel, backend)
+        center_cache[key] = (center_image, np.asarray(center_image))
+    return center_cache[key]
+
+
+def collect_center_paths(center_path):
+    """
+    Expand a center image path, a folder of center images or a comma-separated list into a sorted list of paths.
+    """
+    valid_extensions = ('.png', '.jpg', '.jpeg', '.tiff', '.tif', '.webp', '.bmp')
+
+    if os.path.isfile(center_path):
+        return [center_path]
+    if os.path.isdir(center_path):
+        return sorted(os.path.join(center_path, f) for f in os.listdir(center_path)
+                      if os.path.isfile(os.path.join(center_path, f)) and f.lower().endswith(valid_extensions))
+    return [p.strip() for p in center_path.split(',') if p.strip()]
+
+
+def unique_base_filenames(center_image_paths):
+    """
+    Name each center variant after its file, suffixing an index when two centers share a name.
+    """
+    base_filenames = []
+    for path in center_image_paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        base_filename = stem
+        suffix = 2
+        while base_filename in base_filenames:
+            base_filename = f"{stem}_{suffix}"
+            suffix += 1
+        base_filenames.append(base_filename)
+    return base_filenames
+
+
+def load_input_frames(input_folder):
+    """
+    Decode every input frame once into an array, closing each image so only the array stays in memory.
+    Palette, CMYK and other modes that don't blend or round-trip through an array are converted to RGB/RGBA.
+    """
     input_files = sorted([f for f in os.listdir(input_folder) if os.path.isfile(os.path.join(input_folder, f))])
-    input_images = [Image.open(os.path.join(input_folder, f)) for f in input_files]
+    input_arrays = []
+    mode = None
+
+    for f in input_files:
+        with Image.open(os.path.join(input_folder, f)) as image:
+            if mode is None:
+                mode = image.mode
+                if mode not in ('L', 'LA', 'RGB', 'RGBA'):
+                    mode = 'RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB'
+            if image.mode != mode:
+                image = image.convert(mode)
+            input_arrays.append(np.array(image))
+
+    return input_files, input_arrays, mode
+
+
+def process_tween_images(input_folder, center_image_paths, num_tween_frames, image_format, compression, repeat_frames,
+                         chain_centers=False, resize_kernel='lanczos', resize_backend='pillow'):
+    if isinstance(center_image_paths, str):
+        center_image_paths = [center_image_paths]
+
+    # Decode every input frame once; the arrays are shared by all center variants
+    input_files, input_arrays, mode = load_input_frames(input_folder)
 
     # Get the size from the first image in the folder
-    target_size = input_images[0].size
+    target_size = (input_arrays[0].shape[1], input_arrays[0].shape[0])
 
-    # Ensure center image is the same format and size as input images
-    center_image = Image.open(center_image_path).convert(input_images[0].mode)
-    if center_image.size != target_size:
-        center_image = letterbox_image(center_image, target_size)
+    # Ensure center images are the same format and size as input images
+    center_cache = {}
+    centers = [load_center_image(path, mode, target_size, center_cache, resize_kernel, resize_backend)
+               for path in center_image_paths]
 
-    base_filename = os.path.splitext(os.path.basename(center_image_path))[0]
     source_folder_name = os.path.basename(os.path.normpath(input_folder))
-    output_folder = setup_output_folder(center_image_path, input_folder)
 
-    anticipated_files = len(input_images) * (repeat_frames * 2 + num_tween_frames * 2)
-    print(f"Anticipated number of files: {anticipated_files}")
+    if chain_centers:
+        # Each input frame tweens through the next center in the sequence, all into one output folder
+        frame_centers = [centers[i % len(centers)] for i in range(len(input_arrays))]
+        base_filename = os.path.splitext(os.path.basename(center_image_paths[0]))[0] + "_chain"
+        variants = [(base_filename, frame_centers)]
+    else:
+        # One output folder per center image, all rendered from the same decoded input frames
+        variants = [(base_filename, [center] * len(input_arrays))
+                    for base_filename, center in zip(unique_base_filenames(center_image_paths), centers)]
+
+    # Encoding dominates the run, so a single pool saves the files for every variant
+    with ProcessPoolExecutor() as executor:
+        for base_filename, frame_centers in variants:
+            output_folder = setup_output_folder(base_filename, input_folder)
 
-    total_files = save_frames_and_tweens(center_image, input_images, num_tween_frames, image_format, compression,
-                                         repeat_frames, output_folder, base_filename, source_folder_name)
+            anticipated_files = len(input_arrays) * (repeat_frames * 2 + num_tween_frames * 2)
+            print(f"Anticipated number of files for {base_filename}: {anticipated_files}")
 
-    print(f"Actual number of files: {total_files}")
+            total_files = save_frames_and_tweens(executor, frame_centers, input_files, input_arrays, num_tween_frames,
+                                                 image_format, compression, repeat_frames, output_folder,
+                                                 base_filename, source_folder_name)
 
+            print(f"Actual number of files for {base_filename}: {total_files}")
 
-def save_frames_and_tweens(center_image, resized_images, num_tween_frames, image_format, compression, repeat_frames,
-                           output_folder, base_filename, source_folder_name):
+
+def save_frames_and_tweens(executor, frame_centers, input_files, input_arrays, num_tween_frames, image_format,
+                           compression, repeat_frames, output_folder, base_filename, source_folder_name):
     frame_index = 0
     counter = 0  # Initialize counter for unique naming
     total_files = 0
-
-    with ProcessPoolExecutor() as executor:
-        for i, current_frame in enumerate(resized_images):
-            print(f"Processing file: {os.path.basename(resized_images[i].filename)}")
-
-            # Save the current frame multiple times
-            for _ in range(repeat_frames):
-                current_generated_filename = os.path.join(output_folder,
-                                                          f"{base_filename}_{source_folder_name}_{frame_index:06d}_frame_{counter:06d}.{image_format}")
-                save_image(current_frame, current_generated_filename, image_format, compression)
-                frame_index += 1
-                counter += 1  # Increment counter for each frame
-                total_files += 1
-
-            # Generate and save tween frames to the center image
-            tween_filenames, counter = generate_tween_frames(current_frame, center_image, num_tween_frames, frame_index,
-                                                             f"{base_filename}_{source_folder_name}", output_folder,
-                                                             image_format, compression, counter)
+    pending = []
+    max_pending = (os.cpu_count() or 1) * 2  # Bound the number of frames queued for encoding
+
+    def submit_save(image, filename):
+        if len(pending) >= max_pending:
+            pending.pop(0).result()
+        pending.append(executor.submit(save_image, image, filename, image_format, compression))
+
+    for i, current_array in enumerate(input_arrays):
+        print(f"Processing file: {input_files[i]}")
+        center_image, center_array = frame_centers[i]
+        current_frame = Image.fromarray(current_array)
+
+        # Save the current frame multiple times
+        for _ in range(repeat_frames):
+            current_generated_filename = os.path.join(output_folder,
+                                                      f"{base_filename}_{source_folder_name}_{frame_index:06d}_frame_{counter:06d}.{image_format}")
+            submit_save(current_frame, current_generated_filename)
+            frame_index += 1
+            counter += 1  # Increment counter for each frame
+            total_files += 1
+
+        # Generate and save tween frames to the center image
+        tween_filenames, counter = generate_tween_frames(current_array, center_array, num_tween_frames, frame_index,
+                                                         f"{base_filename}_{source_folder_name}", output_folder,
+                                                         image_format, compression, counter)
+        for tween_img, tween_filename in tween_filenames:
+            submit_save(tween_img, tween_filename)
+            print(f"Generated tween file: {os.path.basename(tween_filename)}")
+            frame_index += 1  # Increment frame index for each tween frame
+            total_files += 1
+
+        # Save the center image multiple times
+        for _ in range(repeat_frames):
+            center_filename = os.path.join(output_folder,
+                                           f"{base_filename}_{source_folder_name}_{frame_index:06d}_center_{counter:06d}.{image_format}")
+            submit_save(center_image, center_filename)
+            frame_index += 1  # Increment frame index for each center image
+            counter += 1  # Increment counter for each frame
+            total_files += 1
+
+        # Generate and save tween frames from the center image to the next frame
+        if i + 1 < len(input_arrays):
+            next_frame = input_arrays[i + 1]
+            tween_filenames, counter = generate_tween_frames(center_array, next_frame, num_tween_frames,
+                                                             frame_index, f"{base_filename}_{source_folder_name}",
+                                                             output_folder, image_format, compression, counter)
             for tween_img, tween_filename in tween_filenames:
-                save_image(tween_img, tween_filename, image_format, compression)
+                submit_save(tween_img, tween_filename)
                 print(f"Generated tween file: {os.path.basename(tween_filename)}")
                 frame_index += 1  # Increment frame index for each tween frame
                 total_files += 1
 
-            # Save the center image multiple times
-            for _ in range(repeat_frames):
-                center_filename = os.path.join(output_folder,
-                                               f"{base_filename}_{source_folder_name}_{frame_index:06d}_center_{counter:06d}.{image_format}")
-                save_image(center_image, center_filename, image_format, compression)
-                frame_index += 1  # Increment frame index for each center image
-                counter += 1  # Increment counter for each frame
-                total_files += 1
-
-            # Generate and save tween frames from the center image to the next frame
-            if i + 1 < len(resized_images):
-                next_frame = resized_images[i + 1]
-                tween_filenames, counter = generate_tween_frames(center_image, next_frame, num_tween_frames,
-                                                                 frame_index, f"{base_filename}_{source_folder_name}",
-                                                                 output_folder, image_format, compression, counter)
-                for tween_img, tween_filename in tween_filenames:
-                    save_image(tween_img, tween_filename, image_format, compression)
-                    print(f"Generated tween file: {os.path.basename(tween_filename)}")
-                    frame_index += 1  # Increment frame index for each tween frame
-                    total_files += 1
+    for future in pending:
+        future.result()
 
     return total_files
 
@@ -137,10 +230,16 @@ def get_user_input():
         print("Invalid folder path. Please try again.")
         input_folder = input("Enter the path to the folder containing the image sequence: ")
 
-    center_image_path = input("Enter the path to the center image: ")
-    while not os.path.isfile(center_image_path):
+    center_prompt = "Enter the path to the center image (a folder or comma-separated paths for multiple centers): "
+    center_image_paths = collect_center_paths(input(center_prompt))
+    while not center_image_paths or not all(os.path.isfile(p) for p in center_image_paths):
         print("Invalid file path. Please try again.")
-        center_image_path = input("Enter the path to the center image: ")
+        center_image_paths = collect_center_paths(input(center_prompt))
+
+    chain_centers = False
+    if len(center_image_paths) > 1:
+        chain_mode = input("Render a variant per center (default) or chain centers across frames? (v/c): ").lower()
+        chain_centers = chain_mode == 'c'
 
     try:
         num_tween_frames = int(input("Enter the number of tween frames to generate: "))
@@ -169,12 +268,28 @@ def get_user_input():
         print("Invalid input. Please enter a positive integer.")
         sys.exit(1)
 
-    return input_folder, center_image_path, num_tween_frames, image_format, compression, repeat_frames
+    resize_kernel = input(f"Enter the resize filter ({', '.join(RESIZE_KERNELS)}; default is lanczos): ").lower()
+    if resize_kernel not in RESIZE_KERNELS:
+        if resize_kernel != '':
+            print("Invalid resize filter. Defaulting to lanczos.")
+        resize_kernel = 'lanczos'
+
+    resize_backend = input("Enter the resize backend (default is pillow, or type opencv for opencv): ").lower()
+    if resize_backend not in RESIZE_BACKENDS:
+        if resize_backend != '':
+            print("Invalid resize backend. Defaulting to pillow.")
+        resize_backend = 'pillow'
+    resize_backend = resolve_backend(resize_backend, resize_kernel)
+
+    return (input_folder, center_image_paths, num_tween_frames, image_format, compression, repeat_frames,
+            chain_centers, resize_kernel, resize_backend)
 
 
 def main():
-    input_folder, center_image_path, num_tween_frames, image_format, compression, repeat_frames = get_user_input()
-    process_tween_images(input_folder, center_image_path, num_tween_frames, image_format, compression, repeat_frames)
+    (input_folder, center_image_paths, num_tween_frames, image_format, compression, repeat_frames,
+     chain_centers, resize_kernel, resize_backend) = get_user_input()
+    process_tween_images(input_folder, center_image_paths, num_tween_frames, image_format, compression, repeat_frames,
+                         chain_centers, resize_kernel, resize_backend)
 
 
 if __name__ == "__main__":